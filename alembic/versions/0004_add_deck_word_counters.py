@@ -0,0 +1,177 @@
+"""add deck word counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 07:41:37.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTER_COLUMNS = ['total_words', 'easy_count', 'medium_count', 'hard_count', 'words_mastered']
+
+# Transition tables each statement-level counter trigger reads. Postgres
+# allows them only on single-event triggers without a column list, hence
+# one trigger per event.
+TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'OLD TABLE AS old_rows',
+}
+
+
+def _word_count_deltas(changes: str) -> str:
+    """One UPDATE applying the net word counts of (deck_id, difficulty, delta) rows per deck."""
+    return f"""
+            UPDATE decks SET
+                total_words = total_words + deltas.total,
+                easy_count = easy_count + deltas.easy,
+                medium_count = medium_count + deltas.medium,
+                hard_count = hard_count + deltas.hard
+            FROM (
+                SELECT
+                    deck_id,
+                    sum(delta) AS total,
+                    coalesce(sum(delta) FILTER (WHERE difficulty = 'easy'), 0) AS easy,
+                    coalesce(sum(delta) FILTER (WHERE difficulty = 'medium'), 0) AS medium,
+                    coalesce(sum(delta) FILTER (WHERE difficulty = 'hard'), 0) AS hard
+                FROM ({changes}) AS changes
+                GROUP BY deck_id
+            ) AS deltas
+            WHERE decks.id = deltas.deck_id
+                AND (deltas.total, deltas.easy, deltas.medium, deltas.hard) <> (0, 0, 0, 0);"""
+
+
+def _mastered_deltas(changes: str) -> str:
+    """One UPDATE applying the net mastered counts of (user_id, word_id, delta) rows per owned deck."""
+    return f"""
+            UPDATE decks SET words_mastered = words_mastered + deltas.mastered
+            FROM (
+                SELECT words.deck_id, sum(changes.delta) AS mastered
+                FROM ({changes}) AS changes
+                JOIN words ON words.id = changes.word_id
+                JOIN decks ON decks.id = words.deck_id AND decks.user_id = changes.user_id
+                GROUP BY words.deck_id
+            ) AS deltas
+            WHERE decks.id = deltas.deck_id AND deltas.mastered <> 0;"""
+
+
+def create_word_count_triggers() -> None:
+    for event, transition_tables in TRANSITION_TABLES.items():
+        op.execute(f"""
+        CREATE TRIGGER words_{event.lower()}_deck_counts
+        AFTER {event} ON words
+        REFERENCING {transition_tables}
+        FOR EACH STATEMENT EXECUTE FUNCTION decks_update_word_counts()
+        """)
+
+
+def drop_word_count_triggers() -> None:
+    for event in TRANSITION_TABLES:
+        op.execute(f"DROP TRIGGER words_{event.lower()}_deck_counts ON words")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COUNTER_COLUMNS:
+        op.add_column('decks', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    # Word counts follow inserts, deletes and difficulty changes of a deck's
+    # words. The triggers run once per statement and apply each deck's net
+    # change in one UPDATE, so a bulk insert touches a deck row only once.
+    op.execute(f"""
+    CREATE FUNCTION decks_update_word_counts() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {_word_count_deltas("SELECT deck_id, difficulty, 1 AS delta FROM new_rows")}
+        ELSIF TG_OP = 'DELETE' THEN
+            {_word_count_deltas("SELECT deck_id, difficulty, -1 AS delta FROM old_rows")}
+        ELSE
+            {_word_count_deltas(
+                "SELECT deck_id, difficulty, 1 AS delta FROM new_rows "
+                "UNION ALL SELECT deck_id, difficulty, -1 FROM old_rows"
+            )}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    create_word_count_triggers()
+
+    # words_mastered counts the deck owner's mastered words
+    op.execute(f"""
+    CREATE FUNCTION decks_update_words_mastered() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {_mastered_deltas("SELECT user_id, word_id, 1 AS delta FROM new_rows WHERE status = 'mastered'")}
+        ELSIF TG_OP = 'DELETE' THEN
+            {_mastered_deltas("SELECT user_id, word_id, -1 AS delta FROM old_rows WHERE status = 'mastered'")}
+        ELSE
+            {_mastered_deltas(
+                "SELECT user_id, word_id, 1 AS delta FROM new_rows WHERE status = 'mastered' "
+                "UNION ALL SELECT user_id, word_id, -1 FROM old_rows WHERE status = 'mastered'"
+            )}
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    for event, transition_tables in TRANSITION_TABLES.items():
+        op.execute(f"""
+        CREATE TRIGGER user_word_progress_{event.lower()}_deck_mastered
+        AFTER {event} ON user_word_progress
+        REFERENCING {transition_tables}
+        FOR EACH STATEMENT EXECUTE FUNCTION decks_update_words_mastered()
+        """)
+
+    # Backfill the counters for existing decks
+    op.execute("""
+    UPDATE decks SET
+        total_words = counts.total,
+        easy_count = counts.easy,
+        medium_count = counts.medium,
+        hard_count = counts.hard
+    FROM (
+        SELECT
+            deck_id,
+            count(*) AS total,
+            count(*) FILTER (WHERE difficulty = 'easy') AS easy,
+            count(*) FILTER (WHERE difficulty = 'medium') AS medium,
+            count(*) FILTER (WHERE difficulty = 'hard') AS hard
+        FROM words
+        GROUP BY deck_id
+    ) AS counts
+    WHERE decks.id = counts.deck_id
+    """)
+    op.execute("""
+    UPDATE decks SET words_mastered = counts.mastered
+    FROM (
+        SELECT words.deck_id, count(*) AS mastered
+        FROM user_word_progress
+        JOIN words ON words.id = user_word_progress.word_id
+        JOIN decks ON decks.id = words.deck_id AND decks.user_id = user_word_progress.user_id
+        WHERE user_word_progress.status = 'mastered'
+        GROUP BY words.deck_id
+    ) AS counts
+    WHERE decks.id = counts.deck_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for event in TRANSITION_TABLES:
+        op.execute(f"DROP TRIGGER user_word_progress_{event.lower()}_deck_mastered ON user_word_progress")
+    op.execute("DROP FUNCTION decks_update_words_mastered()")
+    drop_word_count_triggers()
+    op.execute("DROP FUNCTION decks_update_word_counts()")
+    for column in reversed(COUNTER_COLUMNS):
+        op.drop_column('decks', column)
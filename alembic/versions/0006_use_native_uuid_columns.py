@@ -0,0 +1,58 @@
+"""use native uuid columns
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15 08:12:45.617302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIMARY_KEYS = ['users', 'decks', 'words', 'achievements', 'study_sessions']
+
+# (constraint name, table, column, referenced table)
+FOREIGN_KEYS = [
+    ('decks_user_id_fkey', 'decks', 'user_id', 'users'),
+    ('words_deck_id_fkey', 'words', 'deck_id', 'decks'),
+    ('user_word_progress_user_id_fkey', 'user_word_progress', 'user_id', 'users'),
+    ('user_word_progress_word_id_fkey', 'user_word_progress', 'word_id', 'words'),
+    ('study_sessions_user_id_fkey', 'study_sessions', 'user_id', 'users'),
+    ('study_sessions_deck_id_fkey', 'study_sessions', 'deck_id', 'decks'),
+    ('user_achievements_user_id_fkey', 'user_achievements', 'user_id', 'users'),
+    ('user_achievements_achievement_id_fkey', 'user_achievements', 'achievement_id', 'achievements'),
+]
+
+
+def _convert(type_, cast: str) -> None:
+    # Foreign keys can't span the type change, so they are dropped and
+    # recreated around it. The deck counter triggers have no column lists,
+    # so they don't block altering the columns they read.
+    for name, table, _, _ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+
+    for table in PRIMARY_KEYS:
+        op.alter_column(table, 'id', type_=type_, postgresql_using=f'id::{cast}')
+    for _, table, column, _ in FOREIGN_KEYS:
+        op.alter_column(table, column, type_=type_, postgresql_using=f'{column}::{cast}')
+
+    for name, table, column, referent in FOREIGN_KEYS:
+        op.create_foreign_key(name, table, referent, [column], ['id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _convert(sa.Uuid(), 'uuid')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _convert(sa.String(), 'text')
@@ -1,102 +1,219 @@
 # app/crud.py
-from datetime import datetime, timedelta, timezone
-from typing import Optional
-
-from passlib.context import CryptContext
-from sqlalchemy import case, distinct, func
-from sqlalchemy.orm import Session
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta, timezone
+from typing import List, Optional
+
+import bcrypt
+from cachetools import TTLCache
+import redis.asyncio as redis
+from sqlalchemy import Date, and_, case, cast, column, distinct, func, insert, inspect, literal, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from . import models, schemas
+from .database import redis_client
+
+logger = logging.getLogger(__name__)
 
-# Setup password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Setup password hashing (bcrypt cost factor, 2^rounds iterations)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    # Users created through Google sign-in have no password hash
+    if not hashed_password:
+        return False
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+# Process pool for the CPU-bound bcrypt work, created once on app startup.
+# When it isn't running (e.g. scripts), the loop's default executor is used.
+_password_executor: Optional[ProcessPoolExecutor] = None
+
+def start_password_executor():
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+def shutdown_password_executor():
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown()
+        _password_executor = None
+
+# Password checks currently running in the pool, keyed by the stored hash and
+# a digest of the attempted password. Identical concurrent checks (e.g. a client
+# retrying a login) wait on the same result instead of each running bcrypt.
+_password_checks_in_flight: dict = {}
+
+async def verify_password_async(plain_password, hashed_password):
+    if not hashed_password:
+        # Nothing to compare against, no need to go through the pool
+        return False
+    key = (hashed_password, hashlib.sha256(plain_password.encode()).digest())
+    check = _password_checks_in_flight.get(key)
+    if check is None:
+        loop = asyncio.get_running_loop()
+        check = loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+        _password_checks_in_flight[key] = check
+        check.add_done_callback(lambda _: _password_checks_in_flight.pop(key, None))
+    # Shielded so a cancelled request doesn't cancel the check for the others
+    return await asyncio.shield(check)
+
+async def get_password_hash_async(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+def _fields_set(update_schema) -> dict:
+    """
+    The fields a client actually sent in a partial update. Update schemas are
+    flat, so this reads them directly instead of a full model_dump() pass.
+    """
+    return {field: getattr(update_schema, field) for field in update_schema.model_fields_set}
+
+# Loader options for the relationships the response schemas read: a Deck
+# includes its words and the full User its decks. Lazy loads aren't possible
+# in an async session, so queries returning these for a response apply them.
+DECK_READ_OPTIONS = (selectinload(models.Deck.words),)
+USER_READ_OPTIONS = (selectinload(models.User.decks).selectinload(models.Deck.words),)
 
 # --- User CRUD ---
 
-def get_user(db: Session, user_id: str):
-    return db.query(models.User).filter(models.User.id == user_id).first()
+async def get_user(db: AsyncSession, user_id: uuid.UUID, with_decks: bool = False):
+    """
+    Get a user by id. Pass with_decks=True when the full User response is
+    returned, since it includes the user's decks and their words.
+    """
+    options = USER_READ_OPTIONS if with_decks else None
+    db_user = await db.get(models.User, user_id, options=options)
+    if db_user is not None and with_decks and "decks" in inspect(db_user).unloaded:
+        # Found in the identity map (e.g. the current user) without its decks
+        db_user = await db.get(models.User, user_id, options=options, populate_existing=True)
+    return db_user
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(models.User).where(models.User.email == email))
+
+# --- Authenticated User Cache ---
+
+# Every authenticated request resolves its token's email to a user. Recently
+# seen users are kept in memory, per process, for a short time. Writes below
+# invalidate the local entry; other workers pick up changes after the TTL.
+AUTH_USER_CACHE_TTL_SECONDS = 60
+_auth_user_cache = TTLCache(maxsize=10_000, ttl=AUTH_USER_CACHE_TTL_SECONDS)
+
+async def get_user_by_email_cached(db: AsyncSession, email: str):
+    """
+    Same as get_user_by_email, served from the in-process cache when possible.
+    The cached user is detached from any session and must be treated as read-only.
+    """
+    db_user = _auth_user_cache.get(email)
+    if db_user is None:
+        db_user = await get_user_by_email(db, email)
+        if db_user is not None:
+            # Detach it so the cache holds a snapshot of the user's columns.
+            # Loads later in this request (e.g. get_user with its decks) get a
+            # fresh instance instead of filling in the cached one.
+            db.expunge(db_user)
+            _auth_user_cache[email] = db_user
+    return db_user
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+def invalidate_cached_user(email: str):
+    _auth_user_cache.pop(email, None)
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return (await db.scalars(select(models.User).offset(skip).limit(limit))).all()
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
+async def create_user(db: AsyncSession, user: schemas.UserCreate, hashed_password: str):
+    """
+    Create a user. Returns None if the email is already registered.
+    """
     db_user = models.User(
         email=user.email, full_name=user.full_name, password_hash=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    try:
+        # The unique constraint on email rejects duplicates, no pre-check needed
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return None
+    await db.refresh(db_user)
     return db_user
 
-def update_user_profile(db: Session, user_id: str, profile_update: schemas.UserProfileUpdate):
+async def update_user_profile(db: AsyncSession, user_id: uuid.UUID, profile_update: schemas.UserProfileUpdate):
     """
     Update a user's profile information.
     """
-    # 1. Fetch the user within the current session using the ID
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not db_user:
-        return None
-    
-    # 2. Get the update data, excluding fields that weren't sent
-    update_data = profile_update.model_dump(exclude_unset=True)
-    
-    # 3. Apply the updates to the fetched user object
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
-        
-    db.commit()
-    db.refresh(db_user)
+    # 1. Get the update data, excluding fields that weren't sent
+    update_data = _fields_set(profile_update)
+
+    # 2. Apply the updates with a single UPDATE, without loading the user first
+    if update_data:
+        result = await db.execute(
+            update(models.User).where(models.User.id == user_id).values(**update_data)
+        )
+        if not result.rowcount:
+            return None
+        await db.commit()
+
+    # 3. Return the current state of the user; the session may hold a stale copy
+    db_user = await db.get(models.User, user_id, populate_existing=True)
+    if db_user is not None:
+        invalidate_cached_user(db_user.email)
     return db_user
 
-def update_user_settings(db: Session, user_id: str, settings_update: schemas.UserSettingsUpdate):
+async def update_user_settings(db: AsyncSession, user_id: uuid.UUID, settings_update: schemas.UserSettingsUpdate):
     """
     Update a user's settings.
     """
-    # 1. Fetch the user within the current session using the ID
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not db_user:
-        return None
-
-    # 2. Get the update data
-    update_data = settings_update.model_dump(exclude_unset=True)
+    # 1. Get the update data
+    update_data = _fields_set(settings_update)
 
-    # 3. Apply the updates
-    for key, value in update_data.items():
-        setattr(db_user, key, value)
-    
-    db.commit()
-    db.refresh(db_user)
+    # 2. Apply the updates with a single UPDATE
+    if update_data:
+        result = await db.execute(
+            update(models.User).where(models.User.id == user_id).values(**update_data)
+        )
+        if not result.rowcount:
+            return None
+        await db.commit()
+        # The weekly goal shown on the dashboard is derived from daily_goal
+        await invalidate_user_stats(user_id)
+
+    # 3. Return the current state of the user; the session may hold a stale copy
+    db_user = await db.get(models.User, user_id, populate_existing=True)
+    if db_user is not None:
+        invalidate_cached_user(db_user.email)
     return db_user
 
-def get_achievements_for_user(db: Session, user_id: str):
+async def get_achievements_for_user(db: AsyncSession, user_id: uuid.UUID):
     """
     Get all achievements, marking which ones the user has unlocked using a single, efficient query.
     """
-    # Subquery to find achievements unlocked by the specific user
-    user_achievements_subquery = db.query(
-        models.UserAchievement.achievement_id,
-        models.UserAchievement.earned_at
-    ).filter(models.UserAchievement.user_id == user_id).subquery()
-
-    # Main query with a LEFT JOIN to get all achievements
-    # and mark the ones that the user has unlocked.
-    results = db.query(
-        models.Achievement,
-        (user_achievements_subquery.c.achievement_id != None).label("is_unlocked"),
-        user_achievements_subquery.c.earned_at
-    ).outerjoin(
-        user_achievements_subquery, models.Achievement.id == user_achievements_subquery.c.achievement_id
-    ).all()
+    # LEFT JOIN straight onto the user's rows of the join table; the user
+    # filter goes in the ON clause so locked achievements are kept.
+    results = await db.execute(
+        select(
+            models.Achievement,
+            models.UserAchievement.achievement_id.is_not(None).label("is_unlocked"),
+            models.UserAchievement.earned_at
+        ).outerjoin(
+            models.UserAchievement,
+            and_(
+                models.UserAchievement.achievement_id == models.Achievement.id,
+                models.UserAchievement.user_id == user_id,
+            )
+        )
+    )
 
     return [
         schemas.AchievementDetail(
@@ -110,259 +227,431 @@ def get_achievements_for_user(db: Session, user_id: str):
         for achievement, is_unlocked, earned_at in results
     ]
 
-def get_user_stats(db: Session, user: models.User) -> schemas.UserDashboardStats:
+# --- Dashboard Stats Cache ---
+
+USER_STATS_CACHE_TTL_SECONDS = 60
+
+def _user_stats_cache_key(user_id: uuid.UUID) -> str:
+    return f"stats:{user_id}"
+
+async def invalidate_user_stats(user_id: uuid.UUID):
+    """
+    Drop the cached dashboard stats for a user after their study data changes.
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.delete(_user_stats_cache_key(user_id))
+    except redis.RedisError as exc:
+        logger.warning("Could not invalidate cached stats for user %s: %s", user_id, exc)
+
+async def get_user_stats_json(db: AsyncSession, user_id: uuid.UUID) -> bytes:
+    """
+    Returns the user's dashboard stats as JSON, served from Redis when a fresh
+    copy is cached. The cached bytes go out as-is, without being parsed back
+    into a model and serialized again.
+    """
+    if redis_client is None:
+        return (await _compute_user_stats(db, user_id)).model_dump_json().encode()
+
+    cache_key = _user_stats_cache_key(user_id)
+    try:
+        cached = await redis_client.get(cache_key)
+    except redis.RedisError as exc:
+        logger.warning("Could not read cached stats, computing them instead: %s", exc)
+        cached = None
+    if cached is not None:
+        return cached
+
+    stats_json = (await _compute_user_stats(db, user_id)).model_dump_json().encode()
+    try:
+        await redis_client.set(cache_key, stats_json, ex=USER_STATS_CACHE_TTL_SECONDS)
+    except redis.RedisError as exc:
+        logger.warning("Could not cache stats: %s", exc)
+    return stats_json
+
+async def _compute_user_stats(db: AsyncSession, user_id: uuid.UUID) -> schemas.UserDashboardStats:
     """
     Calculates a comprehensive set of aggregated stats for the user's dashboard.
     """
-    # --- Existing Stats Calculations ---
-    total_duration_result = db.query(func.sum(models.StudySession.duration_seconds)).filter(models.StudySession.user_id == user.id).scalar()
-    accuracy_result = db.query(func.avg(models.StudySession.score_percentage)).filter(
-        models.StudySession.user_id == user.id, models.StudySession.session_type == 'quiz'
-    ).scalar()
-    total_mastered = db.query(func.count(models.UserWordProgress.word_id)).filter(
-        models.UserWordProgress.user_id == user.id, models.UserWordProgress.status == 'mastered'
-    ).scalar()
-    days_active = db.query(func.count(distinct(func.date(models.StudySession.completed_at)))).filter(
-        models.StudySession.user_id == user.id
-    ).scalar()
-
-    # --- Weekly Goal Progress Calculation ---
     today = datetime.now(timezone.utc)
     start_of_week = today - timedelta(days=today.weekday())
-    weekly_progress_result = db.query(func.sum(models.StudySession.words_reviewed)).filter(
-        models.StudySession.user_id == user.id,
+
+    # --- Scalar Stats Calculation ---
+    # Each aggregate is a subquery of one outer SELECT, so all of them
+    # come back in a single round-trip.
+    total_duration_sq = select(func.sum(models.StudySession.duration_seconds)).where(
+        models.StudySession.user_id == user_id
+    ).scalar_subquery()
+    accuracy_sq = select(func.avg(models.StudySession.score_percentage)).where(
+        models.StudySession.user_id == user_id, models.StudySession.session_type == 'quiz'
+    ).scalar_subquery()
+    total_mastered_sq = select(func.count(models.UserWordProgress.word_id)).where(
+        models.UserWordProgress.user_id == user_id, models.UserWordProgress.status == 'mastered'
+    ).scalar_subquery()
+    days_active_sq = select(func.count(distinct(func.date(models.StudySession.completed_at)))).where(
+        models.StudySession.user_id == user_id
+    ).scalar_subquery()
+    weekly_progress_sq = select(func.sum(models.StudySession.words_reviewed)).where(
+        models.StudySession.user_id == user_id,
         models.StudySession.completed_at >= start_of_week
-    ).scalar()
-    
+    ).scalar_subquery()
+    # Read from the database rather than the (possibly cached) current user,
+    # so a stale copy can't be written back into the shared stats cache.
+    # NULL if the user was deleted mid-request.
+    daily_goal_sq = select(models.User.daily_goal).where(
+        models.User.id == user_id
+    ).scalar_subquery()
+    difficulty_counts = select(
+        func.count(case((models.Word.difficulty == 'easy', 1))).label('easy'),
+        func.count(case((models.Word.difficulty == 'medium', 1))).label('medium'),
+        func.count(case((models.Word.difficulty == 'hard', 1))).label('hard')
+    ).join(models.UserWordProgress).where(
+        models.UserWordProgress.user_id == user_id
+    ).subquery()
+
+    scalar_stats = (await db.execute(
+        select(
+            total_duration_sq.label('total_duration'),
+            accuracy_sq.label('accuracy'),
+            total_mastered_sq.label('total_mastered'),
+            days_active_sq.label('days_active'),
+            weekly_progress_sq.label('weekly_progress'),
+            daily_goal_sq.label('daily_goal'),
+            difficulty_counts.c.easy,
+            difficulty_counts.c.medium,
+            difficulty_counts.c.hard,
+        ).select_from(difficulty_counts)
+    )).one()
 
     # --- 6-Month Progress Calculation ---
     six_months_ago = today - timedelta(days=180)
-    monthly_progress_data = db.query(
-        func.to_char(models.StudySession.completed_at, 'YYYY-MM').label('month'),
-        func.sum(models.StudySession.words_reviewed).label('words_studied')
-    ).filter(
-        models.StudySession.user_id == user.id,
-        models.StudySession.completed_at >= six_months_ago
-    ).group_by('month').order_by('month').all()
+    # Group on the truncated timestamp so months sort chronologically, and
+    # let Postgres format the label instead of parsing it back in Python.
+    month_start = func.date_trunc('month', models.StudySession.completed_at)
+    monthly_progress_data = await db.execute(
+        select(
+            func.to_char(month_start, 'Mon').label('month'),  # "Jan", "Feb", etc.
+            func.sum(models.StudySession.words_reviewed).label('words_studied')
+        ).where(
+            models.StudySession.user_id == user_id,
+            models.StudySession.completed_at >= six_months_ago
+        ).group_by(month_start).order_by(month_start)
+    )
     
     monthly_progress = [
-        schemas.MonthlyProgress(month=datetime.strptime(row.month, '%Y-%m').strftime('%b'), words_studied=row.words_studied)
+        schemas.MonthlyProgress(month=row.month, words_studied=row.words_studied)
         for row in monthly_progress_data
     ]
 
-    difficulty_counts = db.query(
-        func.count(case((models.Word.difficulty == 'easy', 1))).label('easy'),
-        func.count(case((models.Word.difficulty == 'medium', 1))).label('medium'),
-        func.count(case((models.Word.difficulty == 'hard', 1))).label('hard')
-    ).join(models.UserWordProgress).filter(
-        models.UserWordProgress.user_id == user.id
-    ).first()
-
     # --- This Week's Activity Calculation ---
     seven_days_ago = today - timedelta(days=6)
-    
-    # This query groups study sessions by day for the last 7 days
-    # and sums the words reviewed for each day.
-    # The specific date functions (like strftime or to_char) can vary by database.
-    # `func.date()` is generally cross-compatible.
-    weekly_activity_data = db.query(
-        func.date(models.StudySession.completed_at).label('study_date'),
-        func.sum(models.StudySession.words_reviewed).label('words_studied')
-    ).filter(
-        models.StudySession.user_id == user.id,
-        models.StudySession.completed_at >= seven_days_ago
-    ).group_by('study_date').order_by('study_date').all()
-    
-    # Create a dictionary for easy lookup
-    activity_map = {row.study_date.strftime('%Y-%m-%d'): row.words_studied for row in weekly_activity_data}
-
-    # Create the final list, filling in 0 for days with no activity
-    weekly_activity = []
-    for i in range(7):
-        day = seven_days_ago.date() + timedelta(days=i)
-        day_str = day.strftime('%a') # "Mon", "Tue", etc.
-        date_key = day.strftime('%Y-%m-%d')
-        weekly_activity.append(schemas.WeeklyActivity(
-            day=day_str,
-            words_studied=activity_map.get(date_key, 0)
-        ))
+    start_of_window = datetime.combine(seven_days_ago.date(), time.min, tzinfo=timezone.utc)
+
+    # Sum the words reviewed for each of the last 7 days. generate_series
+    # emits one row per day, so days without sessions come back as 0.
+    day_series = func.generate_series(
+        seven_days_ago.date(), today.date(), timedelta(days=1)
+    ).table_valued('day').render_derived()
+    study_date = cast(day_series.c.day, Date)
+    weekly_activity_data = await db.execute(
+        select(
+            func.to_char(day_series.c.day, 'Dy').label('day'),  # "Mon", "Tue", etc.
+            func.coalesce(func.sum(models.StudySession.words_reviewed), 0).label('words_studied')
+        ).select_from(day_series).outerjoin(
+            models.StudySession,
+            and_(
+                models.StudySession.user_id == user_id,
+                models.StudySession.completed_at >= start_of_window,
+                func.date(models.StudySession.completed_at) == study_date,
+            )
+        ).group_by(day_series.c.day).order_by(day_series.c.day)
+    )
 
+    weekly_activity = [
+        schemas.WeeklyActivity(day=row.day, words_studied=row.words_studied)
+        for row in weekly_activity_data
+    ]
 
     return schemas.UserDashboardStats(
-        study_time_seconds=total_duration_result or 0,
-        accuracy_rate=accuracy_result or 0.0,
-        total_words_mastered=total_mastered or 0,
-        days_active=days_active or 0,
-        weekly_words_goal=user.daily_goal * 7,
-        weekly_words_progress=weekly_progress_result or 0,
+        study_time_seconds=scalar_stats.total_duration or 0,
+        accuracy_rate=scalar_stats.accuracy or 0.0,
+        total_words_mastered=scalar_stats.total_mastered or 0,
+        days_active=scalar_stats.days_active or 0,
+        weekly_words_goal=(scalar_stats.daily_goal or 0) * 7,
+        weekly_words_progress=scalar_stats.weekly_progress or 0,
         monthly_progress=monthly_progress,
         difficulty_breakdown=schemas.DifficultyBreakdown(
-            easy=difficulty_counts.easy if difficulty_counts else 0,
-            medium=difficulty_counts.medium if difficulty_counts else 0,
-            hard=difficulty_counts.hard if difficulty_counts else 0,
+            easy=scalar_stats.easy,
+            medium=scalar_stats.medium,
+            hard=scalar_stats.hard,
         ),
         weekly_activity=weekly_activity
     )
 
-def delete_user(db: Session, user_id: str):
+async def delete_user(db: AsyncSession, user_id: uuid.UUID):
     """
     Delete a user.
     """
-    db_user = get_user(db, user_id)
+    db_user = await get_user(db, user_id)
     if not db_user:
         return None
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+    invalidate_cached_user(db_user.email)
     return db_user
 
 # --- Deck CRUD ---
 
-def get_deck(db: Session, deck_id: str):
-    return db.query(models.Deck).filter(models.Deck.id == deck_id).first()
+async def get_deck(db: AsyncSession, deck_id: uuid.UUID, with_words: bool = False):
+    """
+    Get a deck by id. Pass with_words=True when the deck is returned in a
+    response, since the Deck schema includes its words.
+    """
+    options = DECK_READ_OPTIONS if with_words else None
+    db_deck = await db.get(models.Deck, deck_id, options=options)
+    if db_deck is not None and with_words and "words" in inspect(db_deck).unloaded:
+        # Found in the identity map (e.g. from an ownership check) without its words
+        db_deck = await db.get(models.Deck, deck_id, options=options, populate_existing=True)
+    return db_deck
 
-def get_decks_by_user(db: Session, user_id: str, category: Optional[str] = None, skip: int = 0, limit: int = 100):
-    query = db.query(models.Deck).filter(models.Deck.user_id == user_id)
+async def get_decks_by_user(db: AsyncSession, user_id: uuid.UUID, category: Optional[str] = None, skip: int = 0, limit: int = 100):
+    # The response includes each deck's words; load them all in one extra
+    # query instead of one lazy load per deck.
+    query = select(models.Deck).options(*DECK_READ_OPTIONS).where(models.Deck.user_id == user_id)
     if category:
-        query = query.filter(models.Deck.category == category)
-    return query.offset(skip).limit(limit).all()
-
-def count_total_words_in_deck(db: Session, deck_id: str) -> int:
-    return db.query(models.Word).filter(models.Word.deck_id == deck_id).count()
-
-def count_words_by_status(db: Session, deck_id: str, status: models.StatusEnum, user_id: str) -> int:
-    return db.query(models.UserWordProgress).join(models.Word).filter(
-        models.Word.deck_id == deck_id,
-        models.UserWordProgress.user_id == user_id,
-        models.UserWordProgress.status == status
-    ).count()
-
-def count_words_by_difficulty(db: Session, deck_id: str, difficulty: models.DifficultyEnum) -> int:
-    return db.query(models.Word).filter(
-        models.Word.deck_id == deck_id,
-        models.Word.difficulty == difficulty
-    ).count()
-
-def create_deck(db: Session, deck: schemas.DeckCreate, user_id: str):
-    db_deck = models.Deck(**deck.model_dump(), user_id=user_id)
+        query = query.where(models.Deck.category == category)
+    return (await db.scalars(query.offset(skip).limit(limit))).all()
+
+async def create_deck(db: AsyncSession, deck: schemas.DeckCreate, user_id: uuid.UUID):
+    # A new deck has no words; setting the empty collection up front means the
+    # response can read it without a lazy load (all other fields are set client-side)
+    db_deck = models.Deck(**deck.model_dump(), user_id=user_id, words=[])
     db.add(db_deck)
-    db.commit()
-    db.refresh(db_deck)
+    await db.commit()
     return db_deck
 
-def update_deck(db: Session, deck_id: str, deck_update: schemas.DeckUpdate):
+async def update_deck(db: AsyncSession, deck_id: uuid.UUID, user_id: uuid.UUID, deck_update: schemas.DeckUpdate):
     """
-    Update a deck's information.
+    Update a deck's information, if it belongs to the user.
+    Returns None when no deck with that id is owned by the user.
     """
-    db_deck = get_deck(db, deck_id)
-    if not db_deck:
-        return None
-
-    update_data = deck_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_deck, key, value)
-
-    db.add(db_deck)
-    db.commit()
-    db.refresh(db_deck)
+    update_data = _fields_set(deck_update)
+    if not update_data:
+        return await get_owned_deck(db, deck_id, user_id)
+    # The ownership check is part of the UPDATE, so a write is one round-trip
+    db_deck = (await db.scalars(
+        update(models.Deck)
+        .where(models.Deck.id == deck_id, models.Deck.user_id == user_id)
+        .values(**update_data)
+        .returning(models.Deck)
+        .options(*DECK_READ_OPTIONS),
+        execution_options={"populate_existing": True},
+    )).one_or_none()
+    if db_deck is not None:
+        await db.commit()
     return db_deck
 
-def delete_deck(db: Session, deck_id: str):
+async def get_owned_deck(db: AsyncSession, deck_id: uuid.UUID, user_id: uuid.UUID):
+    """
+    Get a deck with its words, if it belongs to the user.
+    """
+    return await db.scalar(
+        select(models.Deck)
+        .options(*DECK_READ_OPTIONS)
+        .where(models.Deck.id == deck_id, models.Deck.user_id == user_id)
+    )
+
+async def delete_deck(db: AsyncSession, deck_id: uuid.UUID, user_id: uuid.UUID):
     """
-    Delete a deck.
+    Delete a deck, if it belongs to the user.
     """
-    db_deck = get_deck(db, deck_id)
+    # Loaded rather than deleted with SQL so the ORM cascades to its words
+    db_deck = await get_owned_deck(db, deck_id, user_id)
     if not db_deck:
         return None
-    db.delete(db_deck)
-    db.commit()
+    await db.delete(db_deck)
+    await db.commit()
     return db_deck
 
 # --- Word CRUD ---
 
-def get_word(db: Session, word_id: str):
-    return db.query(models.Word).filter(models.Word.id == word_id).first()
+async def get_word(db: AsyncSession, word_id: uuid.UUID):
+    return await db.get(models.Word, word_id)
 
-def get_words_by_deck(db: Session, deck_id: str, skip: int = 0, limit: int = 100):
-    return (
-        db.query(models.Word)
-        .filter(models.Word.deck_id == deck_id)
+async def get_words_by_deck(db: AsyncSession, deck_id: uuid.UUID, skip: int = 0, limit: int = 100):
+    return (await db.scalars(
+        select(models.Word)
+        .where(models.Word.deck_id == deck_id)
         .offset(skip)
         .limit(limit)
-        .all()
-    )
+    )).all()
+
+def _owned_deck_ids(deck_id: uuid.UUID, user_id: uuid.UUID):
+    """
+    The deck id if the deck belongs to the user, to gate word writes on ownership.
+    """
+    return select(models.Deck.id).where(models.Deck.id == deck_id, models.Deck.user_id == user_id)
 
-def create_word(db: Session, word: schemas.WordCreate, deck_id: str):
-    db_word = models.Word(**word.model_dump(), deck_id=deck_id)
-    db.add(db_word)
-    db.commit()
-    db.refresh(db_word)
+async def create_word(db: AsyncSession, word: schemas.WordCreate, deck_id: uuid.UUID, user_id: uuid.UUID):
+    """
+    Add a word to a deck, if the deck belongs to the user.
+    """
+    # INSERT ... SELECT inserts nothing when the deck isn't the user's
+    values = {"id": uuid.uuid4(), **word.model_dump()}
+    columns = models.Word.__table__.c
+    db_word = (await db.scalars(
+        insert(models.Word)
+        .from_select(
+            ["deck_id", *values],
+            _owned_deck_ids(deck_id, user_id).add_columns(
+                *(literal(value, columns[name].type) for name, value in values.items())
+            ),
+        )
+        .returning(models.Word)
+    )).one_or_none()
+    if db_word is not None:
+        await db.commit()
     return db_word
 
-def update_word(db: Session, word_id: str, word_update: schemas.WordUpdate):
+async def bulk_create_words(db: AsyncSession, words: List[schemas.WordCreate], deck_id: uuid.UUID, user_id: uuid.UUID):
     """
-    Update a word's information.
+    Add many words to a deck with one batched INSERT and a single commit,
+    if the deck belongs to the user. Returns None when it doesn't.
     """
-    db_word = get_word(db, word_id)
-    if not db_word:
+    if not words:
+        owned = await db.scalar(_owned_deck_ids(deck_id, user_id))
+        return [] if owned is not None else None
+    # INSERT ... SELECT over a VALUES list inserts nothing when the deck isn't the user's
+    rows = [{"id": uuid.uuid4(), **word.model_dump()} for word in words]
+    names = list(rows[0])
+    columns = models.Word.__table__.c
+    new_words = values(
+        *(column(name, columns[name].type) for name in names), name="new_words"
+    ).data([tuple(row[name] for name in names) for row in rows])
+    db_words = (await db.scalars(
+        insert(models.Word)
+        .from_select(["deck_id", *names], _owned_deck_ids(deck_id, user_id).add_columns(*new_words.c))
+        .returning(models.Word)
+    )).all()
+    if not db_words:
         return None
-        
-    update_data = word_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_word, key, value)
-        
-    db.add(db_word)
-    db.commit()
-    db.refresh(db_word)
+    await db.commit()
+    return db_words
+
+async def get_owned_word(db: AsyncSession, word_id: uuid.UUID, deck_id: uuid.UUID, user_id: uuid.UUID):
+    """
+    Get a word of a deck, if the deck belongs to the user.
+    """
+    return await db.scalar(
+        select(models.Word).where(
+            models.Word.id == word_id,
+            models.Word.deck_id.in_(_owned_deck_ids(deck_id, user_id))
+        )
+    )
+
+async def update_word(db: AsyncSession, word_id: uuid.UUID, deck_id: uuid.UUID, user_id: uuid.UUID, word_update: schemas.WordUpdate):
+    """
+    Update a word's information, if its deck belongs to the user.
+    """
+    update_data = _fields_set(word_update)
+    if not update_data:
+        return await get_owned_word(db, word_id, deck_id, user_id)
+    db_word = (await db.scalars(
+        update(models.Word)
+        .where(
+            models.Word.id == word_id,
+            models.Word.deck_id.in_(_owned_deck_ids(deck_id, user_id))
+        )
+        .values(**update_data)
+        .returning(models.Word),
+        execution_options={"populate_existing": True},
+    )).one_or_none()
+    if db_word is not None:
+        await db.commit()
     return db_word
 
-def delete_word(db: Session, word_id: str):
+async def delete_word(db: AsyncSession, word_id: uuid.UUID, deck_id: uuid.UUID, user_id: uuid.UUID):
     """
-    Delete a word.
+    Delete a word, if its deck belongs to the user.
     """
-    db_word = get_word(db, word_id)
+    # Loaded rather than deleted with SQL so the ORM cascades to its progress rows
+    db_word = await get_owned_word(db, word_id, deck_id, user_id)
     if not db_word:
         return None
-    db.delete(db_word)
-    db.commit()
+    await db.delete(db_word)
+    await db.commit()
     return db_word
 
-def create_study_session(db: Session, session: schemas.StudySessionCreate, user_id: str):
+async def create_study_session(db: AsyncSession, session: schemas.StudySessionCreate, user_id: uuid.UUID):
     """
     Create a new study session record for a user.
     """
     db_session = models.StudySession(**session.model_dump(), user_id=user_id)
     db.add(db_session)
-    db.commit()
-    db.refresh(db_session)
+    await db.commit()
+    await db.refresh(db_session)
+    await invalidate_user_stats(user_id)
     return db_session
 
 
-def update_word_progress(db: Session, word_id: str, user_id: str, progress_update: schemas.UserWordProgressUpdate):
+def _upsert_word_progress_stmt(user_id: uuid.UUID, statuses: dict):
+    """
+    Build an INSERT ... ON CONFLICT for a user's progress on the given words
+    (word_id -> status), so get-or-create happens atomically in one round-trip.
+    """
+    stmt = pg_insert(models.UserWordProgress).values([
+        {
+            "user_id": user_id,
+            "word_id": word_id,
+            "status": status,
+            "correct_streak": 1 if status == models.StatusEnum.mastered else 0,
+        }
+        for word_id, status in statuses.items()
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=[models.UserWordProgress.user_id, models.UserWordProgress.word_id],
+        set_={
+            "status": stmt.excluded.status,
+            "last_reviewed_at": func.now(),
+            "correct_streak": case(
+                (stmt.excluded.status == models.StatusEnum.mastered, models.UserWordProgress.correct_streak + 1),
+                else_=0,
+            ),
+        },
+    ).returning(models.UserWordProgress)
+
+async def update_word_progress(db: AsyncSession, word_id: uuid.UUID, user_id: uuid.UUID, progress_update: schemas.UserWordProgressUpdate):
     """
     Updates a user's progress for a single word. Creates the record if it doesn't exist.
     """
-    db_progress = db.query(models.UserWordProgress).filter(
-        models.UserWordProgress.word_id == word_id,
-        models.UserWordProgress.user_id == user_id
-    ).first()
-
-    if db_progress:
-        # Update existing progress record
-        db_progress.status = progress_update.status
-        if progress_update.status == models.StatusEnum.mastered:
-             db_progress.correct_streak += 1
-        else:
-             db_progress.correct_streak = 0
-    else:
-        # Create new progress record if one doesn't exist
-        db_progress = models.UserWordProgress(
-            user_id=user_id,
-            word_id=word_id,
-            status=progress_update.status,
-            correct_streak=1 if progress_update.status == models.StatusEnum.mastered else 0
+    stmt = _upsert_word_progress_stmt(user_id, {word_id: progress_update.status})
+    db_progress = (await db.scalars(stmt, execution_options={"populate_existing": True})).one()
+    await db.commit()
+    await invalidate_user_stats(user_id)
+    return db_progress
+
+async def bulk_update_word_progress(db: AsyncSession, user_id: uuid.UUID, items: List[schemas.WordProgressItem]):
+    """
+    Updates a user's progress for many words with a single statement and commit.
+    If a word appears more than once, its last status wins.
+    """
+    statuses = {item.word_id: item.status for item in items}
+    if not statuses:
+        return []
+    stmt = _upsert_word_progress_stmt(user_id, statuses)
+    db_progress = (await db.scalars(stmt, execution_options={"populate_existing": True})).all()
+    await db.commit()
+    await invalidate_user_stats(user_id)
+    return db_progress
+
+async def get_word_owners(db: AsyncSession, word_ids: List[uuid.UUID]) -> dict:
+    """
+    Map each existing word id to the id of the user who owns its deck.
+    """
+    rows = await db.execute(
+        select(models.Word.id, models.Deck.user_id).join(models.Deck).where(
+            models.Word.id.in_(word_ids)
         )
-    
-    db.add(db_progress)
-    db.commit()
-    db.refresh(db_progress)
-    return db_progress
\ No newline at end of file
+    )
+    return {word_id: owner_id for word_id, owner_id in rows}
@@ -1,16 +1,87 @@
 # database.py
+import asyncio
+import logging
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import time
+
+import redis.asyncio as redis
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from dotenv import load_dotenv
 
 # This line loads the environment variables from your .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
 if SQLALCHEMY_DATABASE_URL is None:
     raise ValueError("Missing DATABASE_URL environment variable. Please create a .env file and set it.")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+# Queries slower than this are logged as warnings
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+
+# Connection pool sizing, per worker process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+# The app talks to Postgres through asyncpg; a plain postgresql:// URL works too
+ASYNC_DATABASE_URL = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_pre_ping=True,  # Detect connections dropped by the server before using them
+    pool_recycle=1800,  # Replace connections older than 30 minutes
+    pool_use_lifo=True,  # Reuse warm connections so idle ones can time out
+)
+# expire_on_commit=False: attributes can't be lazily reloaded under asyncio,
+# so objects keep their committed state for the response after a commit.
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    if elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+
+
+async def warm_up_pool():
+    """
+    Open the pool's connections up front, so the first requests after startup
+    don't each wait for a new connection to be established.
+    """
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(DB_POOL_SIZE)), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            # The pool connects lazily anyway; don't keep the app from starting
+            logger.warning("Could not pre-open a database connection: %s", result)
+        else:
+            await result.close()
+
+# Optional Redis cache (used for the dashboard stats). Caching is disabled
+# when REDIS_URL is not set.
+REDIS_URL = os.getenv("REDIS_URL")
+# Short timeouts: an unreachable or stalled Redis should fall back to the
+# database quickly instead of holding up every request that touches the cache.
+REDIS_TIMEOUT_SECONDS = 0.5
+redis_client = (
+    redis.Redis.from_url(
+        REDIS_URL,
+        socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+        socket_timeout=REDIS_TIMEOUT_SECONDS,
+    )
+    if REDIS_URL
+    else None
+)
@@ -0,0 +1,8 @@
+# app/dependencies.py
+from .database import SessionLocal
+
+# Shared by every router, so FastAPI resolves it once per request and the
+# auth dependency and the endpoint use the same session
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
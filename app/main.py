@@ -1,17 +1,33 @@
 # app/main.py
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-from . import models
-from .database import engine
+from . import crud
+from .database import engine, redis_client, warm_up_pool
 from .routers import auth, decks, study, users, words
 
-# Create all database tables
-models.Base.metadata.create_all(bind=engine)
+# The database schema is managed by Alembic (`alembic upgrade head`)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the password hashing pool once, shared by all requests
+    crud.start_password_executor()
+    await warm_up_pool()
+    yield
+    crud.shutdown_password_executor()
+    if redis_client is not None:
+        await redis_client.aclose()
+    await engine.dispose()
 
 app = FastAPI(
     title="Luma API",
     description="API for the Luma flashcard application.",
     version="0.1.0",
+    lifespan=lifespan,
+    # orjson (already a dependency) encodes the larger payloads, like the dashboard stats, faster
+    default_response_class=ORJSONResponse,
 )
 
 # --- Include Routers ---
@@ -4,8 +4,8 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import (Boolean, DateTime, Enum, ForeignKey, Integer, String,
-                        Text, func)
+from sqlalchemy import (Boolean, DateTime, Enum, ForeignKey, Index, Integer,
+                        String, Text, Uuid, func)
 from sqlalchemy.orm import (Mapped, declarative_base, mapped_column,
                             relationship)
 
@@ -31,7 +31,7 @@ class SessionTypeEnum(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     full_name: Mapped[str] = mapped_column(String(255))
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     password_hash: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -56,13 +56,21 @@ class User(Base):
 class Deck(Base):
     __tablename__ = "decks"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(255))
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     category: Mapped[str] = mapped_column(String(100))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
+    # Word counters, kept up to date by database triggers (see migration 0004)
+    # as words and the owner's progress change
+    total_words: Mapped[int] = mapped_column(Integer, server_default="0")
+    easy_count: Mapped[int] = mapped_column(Integer, server_default="0")
+    medium_count: Mapped[int] = mapped_column(Integer, server_default="0")
+    hard_count: Mapped[int] = mapped_column(Integer, server_default="0")
+    words_mastered: Mapped[int] = mapped_column(Integer, server_default="0")
+
     # Relationships
     owner: Mapped["User"] = relationship(back_populates="decks")
     words: Mapped[List["Word"]] = relationship(back_populates="deck", cascade="all, delete-orphan")
@@ -70,9 +78,13 @@ class Deck(Base):
 
 class Word(Base):
     __tablename__ = "words"
+    __table_args__ = (
+        # Words of a deck (deck loads, cascades) and per-deck difficulty counts
+        Index("ix_words_deck_difficulty", "deck_id", "difficulty"),
+    )
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    deck_id: Mapped[str] = mapped_column(ForeignKey("decks.id"), nullable=False)
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    deck_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("decks.id"), nullable=False)
     word: Mapped[str] = mapped_column(String(255))
     definition: Mapped[str] = mapped_column(Text)
     example: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -85,7 +97,7 @@ class Word(Base):
 class Achievement(Base):
     __tablename__ = "achievements"
 
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     title: Mapped[str] = mapped_column(String(255), unique=True)
     description: Mapped[str] = mapped_column(Text)
     icon_name: Mapped[str] = mapped_column(String(100))
@@ -97,9 +109,15 @@ class Achievement(Base):
 
 class UserWordProgress(Base):
     __tablename__ = "user_word_progress"
-
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
-    word_id: Mapped[str] = mapped_column(ForeignKey("words.id"), primary_key=True)
+    __table_args__ = (
+        # Per-user status filters (mastered counts on the dashboard and decks)
+        Index("ix_uwp_user_status", "user_id", "status"),
+        # Progress of a word across users (word deletes cascade through it)
+        Index("ix_uwp_word_status", "word_id", "status"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    word_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("words.id"), primary_key=True)
     status: Mapped[StatusEnum] = mapped_column(Enum(StatusEnum), default=StatusEnum.learning)
     last_reviewed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     correct_streak: Mapped[int] = mapped_column(Integer, default=0)
@@ -110,10 +128,14 @@ class UserWordProgress(Base):
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
-
-    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
-    deck_id: Mapped[str] = mapped_column(ForeignKey("decks.id"), nullable=False)
+    __table_args__ = (
+        # Per-user date-range aggregates for the dashboard stats
+        Index("ix_session_user_completed", "user_id", "completed_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    deck_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("decks.id"), nullable=False)
     session_type: Mapped[SessionTypeEnum] = mapped_column(Enum(SessionTypeEnum), nullable=False)
     score_percentage: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     words_reviewed: Mapped[int] = mapped_column(Integer)
@@ -127,8 +149,8 @@ class StudySession(Base):
 class UserAchievement(Base):
     __tablename__ = "user_achievements"
 
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
-    achievement_id: Mapped[str] = mapped_column(ForeignKey("achievements.id"), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    achievement_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("achievements.id"), primary_key=True)
     earned_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
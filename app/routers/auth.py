@@ -3,13 +3,13 @@ import os
 from datetime import datetime, timedelta
 from typing import Optional
 
+import jwt
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import crud, models, schemas
-from ..database import SessionLocal
+from ..dependencies import get_db
 
 # --- JWT Configuration ---
 # In a real app, load these from your .env file
@@ -24,14 +24,6 @@ router = APIRouter(
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # --- Helper Functions ---
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -47,18 +39,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 # --- API Endpoints ---
 
 @router.post("/register", response_model=schemas.Token, operation_id="register")
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Creates a new user account and returns an access token.
+    Password hashing runs in the process pool, off the event loop.
     """
-    db_user = crud.get_user_by_email(db, email=user.email)
-    if db_user:
+    hashed_password = await crud.get_password_hash_async(user.password)
+    new_user = await crud.create_user(db=db, user=user, hashed_password=hashed_password)
+    if new_user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    
-    new_user = crud.create_user(db=db, user=user)
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -68,13 +60,13 @@ def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=schemas.Token, operation_id="login")
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """
     Authenticates a user and returns an access token.
     Uses form data (username=email, password=password) for OAuth2 compatibility.
     """
-    user = crud.get_user_by_email(db, email=form_data.username)
-    if not user or not crud.verify_password(form_data.password, user.password_hash):
+    user = await crud.get_user_by_email(db, email=form_data.username)
+    if not user or not await crud.verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -89,7 +81,7 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
 
 
 @router.post("/google", response_model=schemas.Token, operation_id="login_google")
-def auth_google(google_token: schemas.GoogleToken, db: Session = Depends(get_db)):
+async def auth_google(google_token: schemas.GoogleToken, db: AsyncSession = Depends(get_db)):
     """
     (Placeholder) Authenticates or registers a user via a Google OAuth token.
     """
@@ -102,12 +94,13 @@ def auth_google(google_token: schemas.GoogleToken, db: Session = Depends(get_db)
 
     # This is a placeholder for demonstration.
     email = f"user_{google_token.google_token[:10]}@google.com"
-    user = crud.get_user_by_email(db, email=email)
+    user = await crud.get_user_by_email(db, email=email)
     if not user:
         user = models.User(email=email, full_name="Google User")
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        # Load server defaults such as created_at for the response
+        await db.refresh(user)
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -115,7 +108,7 @@ def auth_google(google_token: schemas.GoogleToken, db: Session = Depends(get_db)
     )
     return {"access_token": access_token, "token_type": "bearer", "user": user}
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -127,12 +120,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         if email is None:
             raise credentials_exception
         token_data = schemas.TokenData(email=email)
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise credentials_exception
     
     if token_data.email is None:
         raise credentials_exception
-    user = crud.get_user_by_email(db, email=token_data.email)
+    # The token is still verified above on every request; only the user lookup is cached
+    user = await crud.get_user_by_email_cached(db, email=token_data.email)
     if user is None:
         raise credentials_exception
     return user
@@ -1,12 +1,12 @@
 # app/routers/decks.py
 from typing import List, Optional
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models, schemas
-from app.database import SessionLocal
-from app.models import DifficultyEnum, StatusEnum
+from app.dependencies import get_db
 from app.routers.auth import get_current_active_user
 
 router = APIRouter(
@@ -14,105 +14,102 @@ router = APIRouter(
     tags=["Decks"],
 )
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+async def raise_for_missing_deck(db: AsyncSession, deck_id: UUID, forbidden_detail: str):
+    """
+    Called when an ownership-scoped write matched no deck: raises 404 if the
+    deck doesn't exist, or 403 if it belongs to another user.
+    """
+    if await crud.get_deck(db, deck_id=deck_id) is None:
+        raise HTTPException(status_code=404, detail="Deck not found")
+    raise HTTPException(status_code=403, detail=forbidden_detail)
 
 
 @router.post("/", response_model=schemas.Deck, operation_id="create_deck")
-def create_deck(
+async def create_deck(
     deck: schemas.DeckCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Creates a new deck for the authenticated user.
     """
-    return crud.create_deck(db=db, deck=deck, user_id=current_user.id)
+    return await crud.create_deck(db=db, deck=deck, user_id=current_user.id)
 
 
 @router.get("/", response_model=List[schemas.Deck], operation_id="get_decks_by_user")
-def read_decks_for_user(
+async def read_decks_for_user(
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Gets a list of all decks created by the authenticated user.
     Can be filtered by category.
     """
-    return crud.get_decks_by_user(db, user_id=current_user.id, category=category)
+    return await crud.get_decks_by_user(db, user_id=current_user.id, category=category)
 
 
 @router.get("/{deck_id}", response_model=schemas.DeckDetail, operation_id="get_deck_by_id")
-def read_deck(
-    deck_id: str,
-    db: Session = Depends(get_db),
+async def read_deck(
+    deck_id: UUID,
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Gets the detailed information for a single deck, including its words and stats.
     """
-    db_deck = crud.get_deck(db, deck_id=deck_id)
+    db_deck = await crud.get_deck(db, deck_id=deck_id, with_words=True)
     if db_deck is None:
         raise HTTPException(status_code=404, detail="Deck not found")
     if db_deck.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access this deck")
 
-    # --- Calculate Stats at Runtime ---
-    words_mastered = crud.count_words_by_status(db, deck_id=deck_id, status=StatusEnum.mastered, user_id=current_user.id)
-    total_words = crud.count_total_words_in_deck(db, deck_id=deck_id)
-    
-    mastery_percentage = (words_mastered / total_words) * 100 if total_words > 0 else 0
+    # --- Stats come from the deck's counter columns ---
+    total_words = db_deck.total_words
+    mastery_percentage = (db_deck.words_mastered / total_words) * 100 if total_words > 0 else 0
 
+    # Validate the deck's own fields from its attributes rather than spreading
+    # __dict__, which also carries SQLAlchemy's internal instance state
+    deck = schemas.Deck.model_validate(db_deck)
     deck_details = schemas.DeckDetail(
-        **db_deck.__dict__,
+        **dict(deck),
         mastery_percentage=mastery_percentage,
-        words_mastered=words_mastered,
-        words_learning=total_words - words_mastered,
-        easy_count=crud.count_words_by_difficulty(db, deck_id=deck_id, difficulty=DifficultyEnum.easy),
-        medium_count=crud.count_words_by_difficulty(db, deck_id=deck_id, difficulty=DifficultyEnum.medium),
-        hard_count=crud.count_words_by_difficulty(db, deck_id=deck_id, difficulty=DifficultyEnum.hard),
+        words_mastered=db_deck.words_mastered,
+        words_learning=total_words - db_deck.words_mastered,
+        easy_count=db_deck.easy_count,
+        medium_count=db_deck.medium_count,
+        hard_count=db_deck.hard_count,
     )
     return deck_details
 
 
 @router.put("/{deck_id}", response_model=schemas.Deck, operation_id="update_deck")
-def update_deck(
-    deck_id: str,
+async def update_deck(
+    deck_id: UUID,
     deck_update: schemas.DeckUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Updates a deck's information.
     """
-    db_deck = crud.get_deck(db, deck_id=deck_id)
+    db_deck = await crud.update_deck(db, deck_id=deck_id, user_id=current_user.id, deck_update=deck_update)
     if db_deck is None:
-        raise HTTPException(status_code=404, detail="Deck not found")
-    if db_deck.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this deck")
-    
-    return crud.update_deck(db, deck_id=deck_id, deck_update=deck_update)
+        await raise_for_missing_deck(db, deck_id=deck_id, forbidden_detail="Not authorized to update this deck")
+    return db_deck
 
 
 @router.delete("/{deck_id}", response_model=schemas.Deck, operation_id="delete_deck")
-def delete_deck(
-    deck_id: str,
-    db: Session = Depends(get_db),
+async def delete_deck(
+    deck_id: UUID,
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Deletes a deck and all the words within it.
     """
-    db_deck = crud.get_deck(db, deck_id=deck_id)
+    db_deck = await crud.delete_deck(db, deck_id=deck_id, user_id=current_user.id)
     if db_deck is None:
-        raise HTTPException(status_code=404, detail="Deck not found")
-    if db_deck.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this deck")
-        
-    return crud.delete_deck(db, deck_id=deck_id)
\ No newline at end of file
+        await raise_for_missing_deck(db, deck_id=deck_id, forbidden_detail="Not authorized to delete this deck")
+    return db_deck
@@ -1,9 +1,12 @@
 # app/routers/study.py
+from typing import List
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models, schemas
-from app.database import SessionLocal
+from app.dependencies import get_db
 from app.routers.auth import get_current_active_user
 
 router = APIRouter(
@@ -11,48 +14,63 @@ router = APIRouter(
     tags=["Study"],
 )
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 
 @router.post("/sessions", response_model=schemas.StudySession, operation_id="log_study_session")
-def create_study_session(
+async def create_study_session(
     session: schemas.StudySessionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Records the completion of a study session (flashcard or quiz).
     """
     # Verify the user owns the deck they are studying
-    db_deck = crud.get_deck(db, deck_id=session.deck_id)
+    db_deck = await crud.get_deck(db, deck_id=session.deck_id)
     if not db_deck or db_deck.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to study this deck")
         
-    return crud.create_study_session(db=db, session=session, user_id=current_user.id)
+    return await crud.create_study_session(db=db, session=session, user_id=current_user.id)
 
 
 @router.put("/progress/{word_id}", response_model=schemas.UserWordProgress, operation_id="update_word_progress")
-def update_word_progress(
-    word_id: str,
+async def update_word_progress(
+    word_id: UUID,
     progress: schemas.UserWordProgressUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Updates the user's progress for a single word (e.g., marks it as "mastered").
     """
-    db_word = crud.get_word(db, word_id=word_id)
-    if not db_word:
+    # Look up the word and the owner of its deck with a single join
+    owner_id = (await crud.get_word_owners(db, word_ids=[word_id])).get(word_id)
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Word not found")
 
     # Verify the user owns the deck this word belongs to
-    if db_word.deck.user_id != current_user.id:
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update progress for this word")
 
-    return crud.update_word_progress(db=db, word_id=word_id, user_id=current_user.id, progress_update=progress)
\ No newline at end of file
+    return await crud.update_word_progress(db=db, word_id=word_id, user_id=current_user.id, progress_update=progress)
+
+
+@router.post("/progress/bulk", response_model=List[schemas.UserWordProgress], operation_id="bulk_update_word_progress")
+async def bulk_update_word_progress(
+    progress: schemas.UserWordProgressBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Updates the user's progress for many words at once (e.g., at the end of a study session).
+    All updates are saved in a single transaction.
+    """
+    word_ids = {item.word_id for item in progress.items}
+    owners = await crud.get_word_owners(db, word_ids=list(word_ids))
+    if len(owners) != len(word_ids):
+        raise HTTPException(status_code=404, detail="Word not found")
+
+    # Verify the user owns the decks all these words belong to
+    if any(owner_id != current_user.id for owner_id in owners.values()):
+        raise HTTPException(status_code=403, detail="Not authorized to update progress for these words")
+
+    return await crud.bulk_update_word_progress(db=db, user_id=current_user.id, items=progress.items)
@@ -1,11 +1,11 @@
 # app/routers/users.py
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models, schemas
-from app.database import SessionLocal
+from app.dependencies import get_db
 from app.routers.auth import get_current_active_user  # Import the dependency
 
 router = APIRouter(
@@ -13,64 +13,63 @@ router = APIRouter(
     tags=["Users"],
 )
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 
 @router.get("/me", response_model=schemas.User, operation_id="get_user")
-def read_users_me(current_user: models.User = Depends(get_current_active_user)):
+async def read_users_me(
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
     """
     Fetches the profile data for the currently authenticated user.
     """
-    return current_user
+    # Reload with decks and words, which the User response includes
+    return await crud.get_user(db, user_id=current_user.id, with_decks=True)
 
 
-@router.put("/me", response_model=schemas.User, operation_id="update_user")
-def update_user_me(
+@router.put("/me", response_model=schemas.UserProfile, operation_id="update_user")
+async def update_user_me(
     profile_update: schemas.UserProfileUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
     Updates the profile of the currently authenticated user.
     """
-    return crud.update_user_profile(db=db, user_id=current_user.id, profile_update=profile_update)
+    return await crud.update_user_profile(db=db, user_id=current_user.id, profile_update=profile_update)
 
 
-@router.put("/me/settings", response_model=schemas.User, operation_id="update_settings")
-def update_user_me_settings(
+@router.put("/me/settings", response_model=schemas.UserProfile, operation_id="update_settings")
+async def update_user_me_settings(
     settings_update: schemas.UserSettingsUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
     Updates user-specific settings for the currently authenticated user.
     """
-    return crud.update_user_settings(db=db, user_id=current_user.id, settings_update=settings_update)
+    return await crud.update_user_settings(db=db, user_id=current_user.id, settings_update=settings_update)
 
 
 @router.get("/me/achievements", response_model=List[schemas.AchievementDetail], operation_id="get_achievements")
-def read_user_me_achievements(
-    db: Session = Depends(get_db),
+async def read_user_me_achievements(
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
     Gets the list of all achievements for the currently authenticated user.
     """
-    return crud.get_achievements_for_user(db=db, user_id=current_user.id)
+    return await crud.get_achievements_for_user(db=db, user_id=current_user.id)
 
 
 @router.get("/me/stats", response_model=schemas.UserDashboardStats, operation_id="get_stats")
-def read_user_me_stats(
-    db: Session = Depends(get_db),
+async def read_user_me_stats(
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
     """
     Fetches a comprehensive set of statistics for the user's profile dashboards.
+    The stats are already serialized JSON (response_model only documents them),
+    so they're returned directly instead of being validated again.
     """
-    return crud.get_user_stats(db=db, user=current_user)
\ No newline at end of file
+    stats_json = await crud.get_user_stats_json(db=db, user_id=current_user.id)
+    return Response(content=stats_json, media_type="application/json")
\ No newline at end of file
@@ -1,10 +1,14 @@
 # app/routers/words.py
+from typing import List
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models, schemas
-from app.database import SessionLocal
+from app.dependencies import get_db
 from app.routers.auth import get_current_active_user
+from app.routers.decks import raise_for_missing_deck
 
 router = APIRouter(
     # The prefix is nested under decks because words always belong to a deck
@@ -12,79 +16,86 @@ router = APIRouter(
     tags=["Words"],
 )
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+async def raise_for_missing_deck_word(db: AsyncSession, deck_id: UUID, user_id: UUID, forbidden_detail: str):
+    """
+    Called when an ownership-scoped word write matched nothing: raises 404 or
+    403 for the deck, or 404 for the word if the user does own the deck.
+    """
+    db_deck = await crud.get_deck(db, deck_id=deck_id)
+    if db_deck is None:
+        raise HTTPException(status_code=404, detail="Deck not found")
+    if db_deck.user_id != user_id:
+        raise HTTPException(status_code=403, detail=forbidden_detail)
+    raise HTTPException(status_code=404, detail="Word not found")
 
 
 @router.post("/", response_model=schemas.Word, operation_id="create_word")
-def create_word_for_deck(
-    deck_id: str,
+async def create_word_for_deck(
+    deck_id: UUID,
     word: schemas.WordCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Adds a new word to a specific deck.
     Ensures the current user owns the deck.
     """
-    db_deck = crud.get_deck(db, deck_id=deck_id)
-    if not db_deck:
-        raise HTTPException(status_code=404, detail="Deck not found")
-    if db_deck.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to add words to this deck")
-    
-    return crud.create_word(db=db, word=word, deck_id=deck_id)
+    db_word = await crud.create_word(db=db, word=word, deck_id=deck_id, user_id=current_user.id)
+    if db_word is None:
+        await raise_for_missing_deck(db, deck_id=deck_id, forbidden_detail="Not authorized to add words to this deck")
+    return db_word
+
+
+@router.post("/bulk", response_model=List[schemas.Word], operation_id="bulk_create_words")
+async def bulk_create_words_for_deck(
+    deck_id: UUID,
+    words: schemas.WordBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user),
+):
+    """
+    Adds many words to a specific deck at once (e.g., when importing a deck).
+    All words are inserted in a single batch, if the current user owns the deck.
+    """
+    db_words = await crud.bulk_create_words(db=db, words=words.words, deck_id=deck_id, user_id=current_user.id)
+    if db_words is None:
+        await raise_for_missing_deck(db, deck_id=deck_id, forbidden_detail="Not authorized to add words to this deck")
+    return db_words
 
 
 @router.put("/{word_id}", response_model=schemas.Word, operation_id="update_word")
-def update_word(
-    deck_id: str,
-    word_id: str,
+async def update_word(
+    deck_id: UUID,
+    word_id: UUID,
     word: schemas.WordUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Updates a word's information.
     Ensures the current user owns the deck containing the word.
     """
-    db_deck = crud.get_deck(db, deck_id=deck_id)
-    if not db_deck:
-        raise HTTPException(status_code=404, detail="Deck not found")
-    if db_deck.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to modify this deck's words")
-
-    db_word = crud.update_word(db, word_id=word_id, word_update=word)
+    db_word = await crud.update_word(db, word_id=word_id, deck_id=deck_id, user_id=current_user.id, word_update=word)
     if db_word is None:
-        raise HTTPException(status_code=404, detail="Word not found")
-        
+        # Nothing matched: tell a missing or foreign deck from a missing word
+        await raise_for_missing_deck_word(db, deck_id=deck_id, user_id=current_user.id, forbidden_detail="Not authorized to modify this deck's words")
     return db_word
 
 
 @router.delete("/{word_id}", response_model=schemas.Word, operation_id="delete_word")
-def delete_word(
-    deck_id: str,
-    word_id: str,
-    db: Session = Depends(get_db),
+async def delete_word(
+    deck_id: UUID,
+    word_id: UUID,
+    db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ):
     """
     Deletes a word from a deck.
     Ensures the current user owns the deck containing the word.
     """
-    db_deck = crud.get_deck(db, deck_id=deck_id)
-    if not db_deck:
-        raise HTTPException(status_code=404, detail="Deck not found")
-    if db_deck.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to delete this deck's words")
-
-    db_word = crud.delete_word(db, word_id=word_id)
+    db_word = await crud.delete_word(db, word_id=word_id, deck_id=deck_id, user_id=current_user.id)
     if db_word is None:
-        raise HTTPException(status_code=404, detail="Word not found")
-        
+        # Nothing matched: tell a missing or foreign deck from a missing word
+        await raise_for_missing_deck_word(db, deck_id=deck_id, user_id=current_user.id, forbidden_detail="Not authorized to delete this deck's words")
     return db_word
\ No newline at end of file
@@ -3,12 +3,17 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic.dataclasses import dataclass
 
 from .models import DifficultyEnum, SessionTypeEnum, StatusEnum
 
 
 # --- Base Schemas ---
+class OrmModel(BaseModel):
+    """Base for response schemas that are read from ORM objects."""
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
 class WordBase(BaseModel):
     word: str
     definition: str
@@ -18,6 +23,13 @@ class WordBase(BaseModel):
 class WordCreate(WordBase):
     pass
 
+# Upper bounds on items per bulk request; larger batches are split by the client
+MAX_BULK_WORDS = 1000
+MAX_BULK_PROGRESS = 1000
+
+class WordBulkCreate(BaseModel):
+    words: List[WordCreate] = Field(max_length=MAX_BULK_WORDS)
+
 class WordUpdate(BaseModel):
     word: Optional[str] = None
     definition: Optional[str] = None
@@ -56,15 +68,20 @@ class UserSettingsUpdate(BaseModel):
     dark_mode_enabled: Optional[bool] = None
 
 # --- Schemas for Stats and Achievements Responses ---
-class WeeklyActivity(BaseModel):
+# The dashboard's per-day and per-month records are built in bulk and only
+# serialized, so they are slotted dataclasses rather than full models.
+@dataclass(slots=True, frozen=True)
+class WeeklyActivity:
     day: str  # e.g., "Mon", "Tue"
     words_studied: int
 
-class MonthlyProgress(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MonthlyProgress:
     month: str  # e.g., "Jan", "Feb"
     words_studied: int
 
-class DifficultyBreakdown(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DifficultyBreakdown:
     easy: int
     medium: int
     hard: int
@@ -80,47 +97,29 @@ class UserDashboardStats(BaseModel):
     difficulty_breakdown: DifficultyBreakdown
     weekly_activity: List[WeeklyActivity]
 
-class AchievementDetail(BaseModel):
-    id: str
+class AchievementDetail(OrmModel):
+    id: uuid.UUID
     title: str
     description: str
     icon_name: str
     is_unlocked: bool
     earned_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-
-# --- Schemas for Authentication ---
-class Token(BaseModel):
-    access_token: str
-    token_type: str
-    user: "User"
-
-class TokenData(BaseModel):
-    email: Optional[str] = None
-
-class GoogleToken(BaseModel):
-    google_token: str
-
-
 # --- Full Schemas (for reading data from the API) ---
+# Response schemas with enum fields keep their plain string values
+# (use_enum_values), so serializing them doesn't go through the enum.
 
-class Word(WordBase):
-    id: str
-    deck_id: str
+class Word(WordBase, OrmModel):
+    id: uuid.UUID
+    deck_id: uuid.UUID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(use_enum_values=True)
 
-class Deck(DeckBase):
-    id: str
-    user_id: str
+class Deck(DeckBase, OrmModel):
+    id: uuid.UUID
+    user_id: uuid.UUID
     words: List[Word] = []
 
-    class Config:
-        from_attributes = True
-
 class DeckDetail(Deck):
     mastery_percentage: float
     words_mastered: int
@@ -129,8 +128,8 @@ class DeckDetail(Deck):
     medium_count: int
     hard_count: int
 
-class User(UserBase):
-    id: str
+class UserProfile(UserBase, OrmModel):
+    id: uuid.UUID
     avatar_url: Optional[str] = None
     bio: Optional[str] = None
     streak: int
@@ -141,56 +140,59 @@ class User(UserBase):
     sound_effects_enabled: bool
     dark_mode_enabled: bool
     created_at: datetime
+
+class User(UserProfile):
     decks: List[Deck] = []
 
-    class Config:
-        from_attributes = True
+# --- Schemas for Authentication ---
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+    user: UserProfile
+
+class TokenData(BaseModel):
+    email: Optional[str] = None
+
+class GoogleToken(BaseModel):
+    google_token: str
 
 # --- Schemas for other models ---
 
-class Achievement(BaseModel):
-    id: str
+class Achievement(OrmModel):
+    id: uuid.UUID
     title: str
     description: str
     icon_name: str
 
-    class Config:
-        from_attributes = True
-
-class UserAchievement(BaseModel):
-    user_id: str
-    achievement_id: str
+class UserAchievement(OrmModel):
+    user_id: uuid.UUID
+    achievement_id: uuid.UUID
     earned_at: datetime
 
-    class Config:
-        from_attributes = True
-
-class StudySession(BaseModel):
-    id: str
-    user_id: str
-    deck_id: str
+class StudySession(OrmModel):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    deck_id: uuid.UUID
     session_type: SessionTypeEnum
     score_percentage: Optional[int] = None
     words_reviewed: int
     completed_at: datetime
     duration_seconds: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(use_enum_values=True)
 
-class UserWordProgress(BaseModel):
-    user_id: str
-    word_id: str
+class UserWordProgress(OrmModel):
+    user_id: uuid.UUID
+    word_id: uuid.UUID
     status: StatusEnum
     last_reviewed_at: datetime
     correct_streak: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(use_enum_values=True)
 
 # --- Schemas for Study Endpoints ---
 class StudySessionCreate(BaseModel):
-    deck_id: str
+    deck_id: uuid.UUID
     session_type: SessionTypeEnum
     score_percentage: Optional[int] = None
     words_reviewed: int
@@ -199,4 +201,9 @@ class StudySessionCreate(BaseModel):
 class UserWordProgressUpdate(BaseModel):
     status: StatusEnum
 
-Token.model_rebuild()
\ No newline at end of file
+class WordProgressItem(BaseModel):
+    word_id: uuid.UUID
+    status: StatusEnum
+
+class UserWordProgressBulkUpdate(BaseModel):
+    items: List[WordProgressItem] = Field(max_length=MAX_BULK_PROGRESS)
\ No newline at end of file
@@ -1,60 +1,48 @@
 # app/seed.py
-from sqlalchemy.orm import Session
+import asyncio
+import logging
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
 from app.database import SessionLocal, engine
 
-ACHIEVEMENTS_TO_CREATE = [
-    {
-        "title": "First Steps",
-        "description": "Learn your first 10 words",
-        "icon_name": "star",
-    },
-    {
-        "title": "Word Master",
-        "description": "Learn 100 words",
-        "icon_name": "award",
-    },
-    {
-        "title": "Streak Warrior",
-        "description": "Maintain a 7-day streak",
-        "icon_name": "zap",
-    },
-    {
-        "title": "Polyglot",
-        "description": "Study 3 different languages",
-        "icon_name": "globe",
-    },
-    {
-        "title": "Dedicated Learner",
-        "description": "Study for 30 consecutive days",
-        "icon_name": "calendar",
-    },
-]
-
-def seed_achievements(db: Session):
-    print("Seeding achievements...")
-    for ach_data in ACHIEVEMENTS_TO_CREATE:
-        # Check if achievement with this title already exists
-        db_achievement = db.query(models.Achievement).filter(models.Achievement.title == ach_data["title"]).first()
-        if not db_achievement:
-            # If it doesn't exist, create it without specifying the ID
-            new_achievement = models.Achievement(
-                title=ach_data["title"],
-                description=ach_data["description"],
-                icon_name=ach_data["icon_name"],
-            )
-            db.add(new_achievement)
-            print(f"  - Created achievement: {ach_data['title']}")
-    db.commit()
-    print("Seeding complete.")
+logger = logging.getLogger(__name__)
+
+# (title, description, icon_name)
+ACHIEVEMENTS_TO_CREATE: tuple[tuple[str, str, str], ...] = (
+    ("First Steps", "Learn your first 10 words", "star"),
+    ("Word Master", "Learn 100 words", "award"),
+    ("Streak Warrior", "Maintain a 7-day streak", "zap"),
+    ("Polyglot", "Study 3 different languages", "globe"),
+    ("Dedicated Learner", "Study for 30 consecutive days", "calendar"),
+)
+
+async def seed_achievements(db: AsyncSession):
+    # One statement for all rows; titles that already exist are skipped
+    # by the unique constraint instead of being looked up one by one.
+    created = await db.scalars(
+        pg_insert(models.Achievement)
+        .values([
+            {"title": title, "description": description, "icon_name": icon_name}
+            for title, description, icon_name in ACHIEVEMENTS_TO_CREATE
+        ])
+        .on_conflict_do_nothing(index_elements=[models.Achievement.title])
+        .returning(models.Achievement.title)
+    )
+    created_titles = created.all()
+    await db.commit()
+    logger.info("Seeded %d new achievements: %s", len(created_titles), created_titles)
+
+
+async def main():
+    async with SessionLocal() as db:
+        await seed_achievements(db)
+    await engine.dispose()
 
 
 if __name__ == "__main__":
-    # Ensure tables are created before seeding
-    models.Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
-    try:
-        seed_achievements(db)
-    finally:
-        db.close()
\ No newline at end of file
+    # Tables must already exist: run `alembic upgrade head` before seeding
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
\ No newline at end of file